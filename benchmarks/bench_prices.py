@@ -0,0 +1,71 @@
+# benchmarks/bench_prices.py
+"""
+Benchmark batch price normalization against the old per-card parsing.
+
+Usage:
+    python benchmarks/bench_prices.py --prices 10000 --repeat 20
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from typing import List, Optional
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.scraper.price_parser import normalize_prices
+
+SCENARIOS = {
+    "single": ["{:.2f}€"],
+    "mixed": ["{:.2f}€", "{:.2f} €", "{:,.2f} $", "{:,.2f} EUR"],
+}
+
+
+def per_card(raw_prices: List[str]) -> List[Optional[float]]:
+    """Previous parse path: one chained replace and float() per card."""
+    values = []
+    for price_text in raw_prices:
+        try:
+            price = price_text.replace("€", "").replace(",", ".").strip()
+            values.append(float(price))
+        except ValueError:
+            values.append(None)
+    return values
+
+
+def timed(func, raw_prices: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(raw_prices)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prices", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"prices={args.prices}")
+    for name, formats in SCENARIOS.items():
+        raw_prices = [
+            random.choice(formats).format(random.uniform(1, 5000))
+            for _ in range(args.prices)
+        ]
+        per_card_time = timed(per_card, raw_prices, args.repeat)
+        batch_time = timed(normalize_prices, raw_prices, args.repeat)
+        per_card_valid = sum(v is not None for v in per_card(raw_prices))
+        batch_valid = sum(normalize_prices(raw_prices)["valid"])
+
+        print(
+            f"{name:<7} per-card {per_card_time * 1e3:7.2f} ms "
+            f"({per_card_valid} parsed)  "
+            f"batch {batch_time * 1e3:7.2f} ms ({batch_valid} parsed)"
+        )
+
+
+if __name__ == "__main__":
+    main()
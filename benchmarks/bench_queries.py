@@ -0,0 +1,145 @@
+# benchmarks/bench_queries.py
+"""
+Micro-benchmark for ProductQueries lookups under concurrent threads.
+
+Usage:
+    python benchmarks/bench_queries.py --products 20000 --threads 8 --lookups 5000
+
+With --profile DIR, the database setup and a single-threaded lookup pass are
+also profiled and written to DIR as .prof files and text summaries.
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+from typing import List
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database.db_manager import DatabaseManager
+from src.database.queries import ProductQueries
+from src.utils.profiling import StageProfiler
+
+CATEGORIES = ["Electronics", "Gadgets", "Toys", "Books", "Garden"]
+
+
+def populate(db_path: str, count: int):
+    DatabaseManager(db_path).setup_database()
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        """
+        INSERT INTO products
+        (product_id, name, description, price, image_url,
+        sale_price, out_of_stock, categories, source_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+        (
+            (
+                str(i),
+                f"Product {i}",
+                "Benchmark product",
+                round(random.uniform(1, 500), 2),
+                f"https://example.com/{i}.jpg",
+                None,
+                0,
+                ",".join(random.sample(CATEGORIES, 2)),
+                f"https://example.com/products/{i}",
+            )
+            for i in range(count)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_lookups(queries: ProductQueries, ids: List[str], latencies: List[float]):
+    local = []
+    for product_id in ids:
+        start = time.perf_counter()
+        kind = random.random()
+        if kind < 0.8:
+            queries.get_product(product_id)
+        elif kind < 0.9:
+            queries.get_category_page(random.choice(CATEGORIES), random.randint(1, 5))
+        else:
+            low = random.randint(1, 400)
+            queries.get_price_range(low, low + 50)
+        local.append(time.perf_counter() - start)
+    latencies.extend(local)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+def bench(db_path: str, args, cache_size: int, label: str):
+    queries = ProductQueries(db_path, cache_size=cache_size)
+    # Distribución sesgada: pocos productos concentran la mayoría de lecturas
+    hot = [str(random.randint(0, args.products - 1)) for _ in range(200)]
+    latencies: List[float] = []
+    threads = []
+    for _ in range(args.threads):
+        ids = [
+            random.choice(hot)
+            if random.random() < 0.8
+            else str(random.randint(0, args.products - 1))
+            for _ in range(args.lookups)
+        ]
+        threads.append(
+            threading.Thread(target=run_lookups, args=(queries, ids, latencies))
+        )
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    queries.close()
+
+    print(
+        f"{label:<10} lookups={len(latencies)} "
+        f"p50={percentile(latencies, 50) * 1e6:.1f}us "
+        f"p99={percentile(latencies, 99) * 1e6:.1f}us "
+        f"throughput={len(latencies) / elapsed:.0f}/s "
+        f"hit_rate={queries.cache.hits / max(1, queries.cache.hits + queries.cache.misses):.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--profile", metavar="DIR", help="Write profiles to DIR")
+    args = parser.parse_args()
+
+    profiler = StageProfiler(enabled=bool(args.profile))
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        with profiler.stage("db"):
+            populate(db_path, args.products)
+        bench(db_path, args, cache_size=0, label="no-cache")
+        bench(db_path, args, cache_size=4096, label="lru-4096")
+
+        if args.profile:
+            # cProfile solo mide el hilo que lo activa: pasada en un único hilo
+            queries = ProductQueries(db_path, cache_size=4096)
+            ids = [
+                str(random.randint(0, args.products - 1)) for _ in range(args.lookups)
+            ]
+            with profiler.stage("lookups"):
+                run_lookups(queries, ids, [])
+            queries.close()
+            for path in profiler.write(args.profile):
+                print(f"Wrote profile: {path}")
+
+
+if __name__ == "__main__":
+    main()
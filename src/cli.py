@@ -0,0 +1,161 @@
+# src/cli.py
+"""
+Single entry point for every role of the scraper:
+
+    python3 cli.py crawl     # scrape products (and process their images)
+    python3 cli.py images    # process images for products already stored
+    python3 cli.py report    # print products by category as CSV
+    python3 cli.py export    # write snapshot/delta exports
+    python3 cli.py maintenance  # remove stale images and compact the database
+
+Heavy dependencies (requests, bs4, PIL) are imported inside the commands
+that need them, so report and export start without loading them.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+# Solo dependencias ligeras (stdlib + sqlite3) a nivel de módulo
+from database.export import add_export_arguments, run_export
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture cProfile and tracemalloc data per stage",
+    )
+    parser.add_argument(
+        "--profile-sample-rate",
+        type=float,
+        default=1.0,
+        help="Fraction of stage calls to profile (default: 1.0)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        help="Where to write the profiles (default: profiles/<timestamp>)",
+    )
+
+
+def create_profiler(args: argparse.Namespace):
+    from utils.profiling import StageProfiler
+
+    return StageProfiler(enabled=args.profile, sample_rate=args.profile_sample_rate)
+
+
+def write_profiles(args: argparse.Namespace, profiler):
+    if not args.profile:
+        return
+
+    import config
+    from datetime import datetime
+
+    output_dir = args.profile_dir or os.path.join(
+        config.PROFILE_FOLDER, datetime.now().strftime("%Y%m%d-%H%M%S")
+    )
+    for path in profiler.write(output_dir):
+        print(f"Wrote profile: {path}")
+
+
+def run_crawl(args: argparse.Namespace) -> int:
+    import config
+    from main import crawl
+    from database.report import query_products
+
+    profiler = create_profiler(args)
+    try:
+        crawl(process_images=not args.skip_images, profiler=profiler)
+    finally:
+        write_profiles(args, profiler)
+    if not args.skip_report:
+        query_products(config.DB_NAME)
+    return 0
+
+
+def run_images(args: argparse.Namespace) -> int:
+    from main import process_stored_images
+
+    profiler = create_profiler(args)
+    try:
+        process_stored_images(profiler=profiler)
+    finally:
+        write_profiles(args, profiler)
+    return 0
+
+
+def run_report(args: argparse.Namespace) -> int:
+    import config
+    from database.report import query_products
+
+    query_products(config.DB_NAME)
+    return 0
+
+
+def export_products(args: argparse.Namespace) -> int:
+    return run_export(vars(args))
+
+
+def maintain_database(args: argparse.Namespace) -> int:
+    import config
+    from database.db_manager import DatabaseManager
+    from database.maintenance import print_maintenance_report, run_maintenance
+    from main import create_image_processor
+
+    db_manager = DatabaseManager(config.DB_NAME)
+    db_manager.setup_database()
+    # Registrar primero las imágenes de la estructura plana anterior: sin
+    # fila en images no se pueden evaluar y nunca se borran
+    image_processor = create_image_processor(db_manager=db_manager)
+    stats = image_processor.migrate_legacy_files(args.batch_size)
+    stats.update(run_maintenance(config.DB_NAME, args.batch_size))
+    print_maintenance_report(stats)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="E-commerce product scraper.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl_parser = subparsers.add_parser("crawl", help="Scrape products")
+    crawl_parser.add_argument(
+        "--skip-images", action="store_true", help="Do not download or process images"
+    )
+    crawl_parser.add_argument(
+        "--skip-report", action="store_true", help="Do not print the final report"
+    )
+    add_profile_arguments(crawl_parser)
+    crawl_parser.set_defaults(handler=run_crawl)
+
+    images_parser = subparsers.add_parser(
+        "images", help="Process images for stored products"
+    )
+    add_profile_arguments(images_parser)
+    images_parser.set_defaults(handler=run_images)
+
+    report_parser = subparsers.add_parser("report", help="Print products by category")
+    report_parser.set_defaults(handler=run_report)
+
+    export_parser = subparsers.add_parser("export", help="Export products")
+    add_export_arguments(export_parser)
+    export_parser.set_defaults(handler=export_products)
+
+    maintenance_parser = subparsers.add_parser(
+        "maintenance", help="Remove stale images and compact the database"
+    )
+    maintenance_parser.add_argument(
+        "--batch-size", type=int, default=500, help="Images deleted per batch"
+    )
+    maintenance_parser.set_defaults(handler=maintain_database)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
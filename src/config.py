@@ -13,6 +13,10 @@ PROCESSED_IMAGES_FOLDER = "product_images"
 # Tamaños de imagen
 IMAGE_SIZES = [(100, 100), (500, 500), (2000, 2000)]
 
+# Rellenar las imágenes con blanco hasta el tamaño exacto. Con False se guardan
+# sin relleno y las dimensiones/offsets quedan en la tabla images
+LETTERBOX_IMAGES = True
+
 # Headers para requests
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -20,3 +24,6 @@ HEADERS = {
 
 # Tiempo de espera entre requests
 REQUEST_DELAY = 1  # segundos
+
+# Carpeta para los perfiles de cProfile/tracemalloc (opción --profile)
+PROFILE_FOLDER = "profiles"
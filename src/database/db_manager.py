@@ -6,6 +6,27 @@ import sys
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+IMAGE_COLUMNS = [
+    "path",
+    "product_id",
+    "kind",
+    "source_url",
+    "format",
+    "width",
+    "height",
+    "bytes",
+    "content_hash",
+    "target_width",
+    "target_height",
+    "offset_x",
+    "offset_y",
+]
+
+PRODUCT_MIGRATIONS = [
+    ("currency", "TEXT"),
+    ("price_valid", "INTEGER DEFAULT 1"),
+]
+
 
 class DatabaseManager:
     def __init__(self, db_name: str):
@@ -16,6 +37,9 @@ class DatabaseManager:
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
 
+        # Solo tiene efecto en bases nuevas; maintenance.py convierte las existentes
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
         cursor.execute(
             """
             CREATE TABLE IF NOT EXISTS products (
@@ -28,12 +52,74 @@ class DatabaseManager:
                 out_of_stock INTEGER,
                 categories TEXT,
                 source_url TEXT,
+                currency TEXT,
+                price_valid INTEGER DEFAULT 1,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """
         )
 
+        # Columnas añadidas después de crear la tabla en bases existentes
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(products)")}
+        for column, definition in PRODUCT_MIGRATIONS:
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE products ADD COLUMN {column} {definition}")
+
+        # Índice para exportaciones incrementales por fecha de actualización
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_products_updated_at
+            ON products (updated_at)
+        """
+        )
+
+        # Índice para consultas ordenadas o filtradas por precio
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_products_price
+            ON products (price)
+        """
+        )
+
+        # Una fila por imagen original o derivada. En las derivadas, width y
+        # height son las de la imagen escalada y offset_x/offset_y su posición
+        # dentro del tamaño objetivo (target_width x target_height)
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS images (
+                path TEXT PRIMARY KEY,
+                product_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                source_url TEXT,
+                format TEXT,
+                width INTEGER,
+                height INTEGER,
+                bytes INTEGER,
+                content_hash TEXT,
+                target_width INTEGER,
+                target_height INTEGER,
+                offset_x INTEGER,
+                offset_y INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_images_product_id
+            ON images (product_id, kind)
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_images_content_hash
+            ON images (content_hash)
+        """
+        )
+
         conn.commit()
         conn.close()
 
@@ -47,7 +133,8 @@ class DatabaseManager:
                 """
                 SELECT 
                     product_id, name, description, price, image_url,
-                    sale_price, out_of_stock, categories, source_url
+                    sale_price, out_of_stock, categories, source_url,
+                    currency, price_valid
                 FROM products 
                 WHERE product_id = ?
             """,
@@ -66,12 +153,37 @@ class DatabaseManager:
                     "out_of_stock": row[6],
                     "categories": row[7],
                     "source_url": row[8],
+                    "currency": row[9],
+                    "price_valid": bool(row[10]),
                 }
             return None
 
         finally:
             conn.close()
 
+    def get_product_image_urls(self, product_ids: List[str]) -> Dict[str, str]:
+        """Return the image URL of every product in product_ids that exists."""
+        if not product_ids:
+            return {}
+
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+
+        try:
+            placeholders = ", ".join("?" for _ in product_ids)
+            cursor.execute(
+                f"""
+                SELECT product_id, image_url
+                FROM products
+                WHERE product_id IN ({placeholders})
+            """,
+                list(product_ids),
+            )
+            return dict(cursor.fetchall())
+
+        finally:
+            conn.close()
+
     def are_products_equal(
         self, product1: Dict[str, Any], product2: Dict[str, Any]
     ) -> bool:
@@ -86,6 +198,7 @@ class DatabaseManager:
             "out_of_stock",
             "categories",
             "source_url",
+            "currency",
         ]
 
         for field in fields_to_compare:
@@ -105,6 +218,11 @@ class DatabaseManager:
                     return False
                 continue
 
+            # Las filas anteriores a la columna currency no la conocen: solo
+            # cuenta como cambio si ambos lados la tienen
+            if field == "currency" and (val1 is None or val2 is None):
+                continue
+
             # Para el resto de campos, comparación directa
             if val1 != val2:
                 return False
@@ -123,19 +241,43 @@ class DatabaseManager:
             # Verificar si el producto ya existe
             existing_product = self.get_existing_product(product["product_id"])
 
+            # Un precio que no se pudo leer no sobrescribe el precio guardado
+            if existing_product and product.get("price_valid") is False:
+                product = dict(
+                    product,
+                    price=existing_product["price"],
+                    sale_price=existing_product["sale_price"],
+                    currency=existing_product["currency"],
+                    price_valid=existing_product["price_valid"],
+                )
+
             # Si el producto existe y es igual, lo saltamos
             if existing_product and self.are_products_equal(existing_product, product):
                 print(f"Skipping unchanged product: {product['product_id']}")
                 return False
 
-            # Si no existe o es diferente, lo actualizamos
+            # Si no existe o es diferente, lo actualizamos. El upsert conserva
+            # created_at y no borra/reinserta la fila como INSERT OR REPLACE
             current_time = datetime.now().isoformat()
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO products 
+                INSERT INTO products 
                 (product_id, name, description, price, image_url, 
-                sale_price, out_of_stock, categories, source_url, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                sale_price, out_of_stock, categories, source_url,
+                currency, price_valid, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(product_id) DO UPDATE SET
+                    name = excluded.name,
+                    description = excluded.description,
+                    price = excluded.price,
+                    image_url = excluded.image_url,
+                    sale_price = excluded.sale_price,
+                    out_of_stock = excluded.out_of_stock,
+                    categories = excluded.categories,
+                    source_url = excluded.source_url,
+                    currency = excluded.currency,
+                    price_valid = excluded.price_valid,
+                    updated_at = excluded.updated_at
             """,
                 (
                     product["product_id"],
@@ -147,6 +289,8 @@ class DatabaseManager:
                     product["out_of_stock"],
                     product["categories"],
                     product["source_url"],
+                    product.get("currency"),
+                    int(product.get("price_valid", True)),
                     current_time,
                 ),
             )
@@ -163,6 +307,89 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def store_image_records(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Store metadata for original and derived image files.
+        Returns True if the records were stored.
+        """
+        if not records:
+            return False
+
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+
+        try:
+            current_time = datetime.now().isoformat()
+            cursor.executemany(
+                f"""
+                INSERT OR REPLACE INTO images
+                ({", ".join(IMAGE_COLUMNS)}, updated_at)
+                VALUES ({", ".join("?" for _ in IMAGE_COLUMNS)}, ?)
+            """,
+                [
+                    tuple(record.get(column) for column in IMAGE_COLUMNS)
+                    + (current_time,)
+                    for record in records
+                ],
+            )
+            conn.commit()
+            return True
+
+        except sqlite3.Error as e:
+            print(f"Database error: {str(e)}")
+            return False
+
+        finally:
+            conn.close()
+
+    def _query_images(self, where: str, params: tuple) -> List[Dict[str, Any]]:
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                f"""
+                SELECT {", ".join(IMAGE_COLUMNS)}
+                FROM images
+                WHERE {where}
+                ORDER BY kind DESC, target_width, target_height
+            """,
+                params,
+            )
+            return [dict(zip(IMAGE_COLUMNS, row)) for row in cursor.fetchall()]
+
+        finally:
+            conn.close()
+
+    def get_images(
+        self, product_id: str, kind: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve image records of a product, optionally filtered by kind."""
+        if kind:
+            return self._query_images(
+                "product_id = ? AND kind = ?", (product_id, kind)
+            )
+        return self._query_images("product_id = ?", (product_id,))
+
+    def find_images_by_hash(self, content_hash: str) -> List[Dict[str, Any]]:
+        """Retrieve every image record whose content has the given hash."""
+        return self._query_images("content_hash = ?", (content_hash,))
+
+    def get_image_placements(self, product_id: str) -> List[Dict[str, Any]]:
+        """Retrieve the dimensions and offsets of a product's derived images."""
+        return [
+            {
+                "path": image["path"],
+                "target_width": image["target_width"],
+                "target_height": image["target_height"],
+                "width": image["width"],
+                "height": image["height"],
+                "offset_x": image["offset_x"],
+                "offset_y": image["offset_y"],
+            }
+            for image in self.get_images(product_id, kind="derivative")
+        ]
+
     def query_and_print_products(self):
         """Query products by category and print in CSV format."""
         conn = sqlite3.connect(self.db_name)
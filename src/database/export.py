@@ -0,0 +1,213 @@
+# src/database/export.py
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+EXPORT_COLUMNS = [
+    "product_id",
+    "name",
+    "description",
+    "price",
+    "image_url",
+    "sale_price",
+    "out_of_stock",
+    "categories",
+    "source_url",
+    "created_at",
+    "updated_at",
+]
+
+EXPORT_FORMATS = ["csv", "jsonl", "parquet"]
+COMPRESSIONS = ["gzip", "zstd"]
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_product_batches(
+    db_path: str, since: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[Tuple]]:
+    """
+    Yield product rows in batches of at most batch_size.
+    When since is given, only rows with updated_at greater than it are returned.
+    The database is opened read-only before the first batch is requested, so a
+    missing database raises sqlite3.Error instead of being created.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    return _iter_batches(conn, since, batch_size)
+
+
+def _iter_batches(
+    conn: sqlite3.Connection, since: Optional[str], batch_size: int
+) -> Iterator[List[Tuple]]:
+    cursor = conn.cursor()
+
+    try:
+        query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM products"
+        params: Tuple = ()
+        if since:
+            # Usa el índice idx_products_updated_at
+            query += " WHERE updated_at > ?"
+            params = (since,)
+        query += " ORDER BY updated_at, product_id"
+
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+    finally:
+        conn.close()
+
+
+def _open_text_output(output_path: str, compression: Optional[str]):
+    """Open a text stream for output_path with the requested compression."""
+    if compression is None:
+        return open(output_path, "w", newline="", encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(output_path, "wt", newline="", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd compression requires the zstandard package")
+        raw = open(output_path, "wb")
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, newline="", encoding="utf-8")
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def _write_csv(batches: Iterator[List[Tuple]], stream) -> int:
+    writer = csv.writer(stream)
+    writer.writerow(EXPORT_COLUMNS)
+
+    count = 0
+    for rows in batches:
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+
+def _write_jsonl(batches: Iterator[List[Tuple]], stream) -> int:
+    count = 0
+    for rows in batches:
+        lines = [
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False)
+            for row in rows
+        ]
+        stream.write("\n".join(lines) + "\n")
+        count += len(rows)
+    return count
+
+
+def _write_parquet(
+    batches: Iterator[List[Tuple]], output_path: str, compression: Optional[str]
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export requires the pyarrow package")
+
+    schema = pa.schema(
+        [
+            ("product_id", pa.string()),
+            ("name", pa.string()),
+            ("description", pa.string()),
+            ("price", pa.float64()),
+            ("image_url", pa.string()),
+            ("sale_price", pa.float64()),
+            ("out_of_stock", pa.int64()),
+            ("categories", pa.string()),
+            ("source_url", pa.string()),
+            ("created_at", pa.string()),
+            ("updated_at", pa.string()),
+        ]
+    )
+
+    count = 0
+    with pq.ParquetWriter(
+        output_path, schema, compression=compression or "none"
+    ) as writer:
+        for rows in batches:
+            columns = list(zip(*rows))
+            table = pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            )
+            writer.write_table(table)
+            count += len(rows)
+    return count
+
+
+def export_products(
+    db_path: str,
+    output_path: str,
+    fmt: str = "csv",
+    since: Optional[str] = None,
+    compression: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Export products to output_path as a full snapshot, or as a delta of rows
+    changed after since (an ISO timestamp). Rows are streamed in batches so
+    memory use does not grow with the table size.
+    Returns the number of exported rows.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    batches = iter_product_batches(db_path, since, batch_size)
+
+    if fmt == "parquet":
+        return _write_parquet(batches, output_path, compression)
+
+    with _open_text_output(output_path, compression) as stream:
+        if fmt == "csv":
+            return _write_csv(batches, stream)
+        return _write_jsonl(batches, stream)
+
+
+def add_export_arguments(parser: argparse.ArgumentParser):
+    """Register the export options on parser."""
+    parser.add_argument("output", help="Output file path")
+    parser.add_argument("--db", default="products.db", help="SQLite database path")
+    parser.add_argument("--format", dest="fmt", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument(
+        "--since", help="Only export products updated after this ISO timestamp"
+    )
+    parser.add_argument("--compression", choices=COMPRESSIONS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+
+def run_export(args: Dict[str, Any]) -> int:
+    """Run an export from parsed arguments and return a process exit code."""
+    try:
+        exported = export_products(
+            args["db"],
+            args["output"],
+            fmt=args["fmt"],
+            since=args["since"],
+            compression=args["compression"],
+            batch_size=args["batch_size"],
+        )
+    except (ValueError, OSError, sqlite3.Error) as e:
+        print(f"Export error: {str(e)}", file=sys.stderr)
+        return 1
+    print(f"Exported {exported} products to {args['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export scraped products.")
+    add_export_arguments(parser)
+    sys.exit(run_export(vars(parser.parse_args())))
@@ -0,0 +1,140 @@
+# src/database/maintenance.py
+
+import os
+import sqlite3
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_BATCH_SIZE = 500
+
+# Imágenes cuyo producto ya no existe, cuya URL de origen cambió o que fueron
+# reemplazadas por una versión más reciente del mismo tipo y tamaño (por
+# ejemplo, tras un cambio de categoría, que cambia el nombre del archivo)
+STALE_IMAGES_QUERY = """
+    SELECT i.path
+    FROM images i
+    LEFT JOIN products p ON p.product_id = i.product_id
+    WHERE p.product_id IS NULL
+       OR (i.source_url IS NOT NULL AND i.source_url != p.image_url)
+       OR EXISTS (
+            SELECT 1 FROM images newer
+            WHERE newer.product_id = i.product_id
+              AND newer.kind = i.kind
+              AND newer.target_width IS i.target_width
+              AND newer.target_height IS i.target_height
+              AND newer.updated_at > i.updated_at
+       )
+    LIMIT ?
+"""
+
+
+def _database_size(cursor: sqlite3.Cursor) -> int:
+    page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+    page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+def _remove_files(paths: List[str]) -> Tuple[int, int]:
+    """Delete files from disk. Returns (files removed, bytes reclaimed)."""
+    removed = 0
+    reclaimed = 0
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"Error removing {path}: {str(e)}", file=sys.stderr)
+            continue
+        removed += 1
+        reclaimed += size
+    return removed, reclaimed
+
+
+def collect_stale_images(
+    conn: sqlite3.Connection, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Delete stale image files and their rows in batches, committing after
+    each batch so the database is never locked for long.
+    """
+    cursor = conn.cursor()
+    stats = {"image_rows": 0, "image_files": 0, "image_bytes": 0}
+
+    while True:
+        paths = [row[0] for row in cursor.execute(STALE_IMAGES_QUERY, (batch_size,))]
+        if not paths:
+            break
+
+        removed, reclaimed = _remove_files(paths)
+        cursor.executemany("DELETE FROM images WHERE path = ?", [(p,) for p in paths])
+        conn.commit()
+
+        stats["image_rows"] += len(paths)
+        stats["image_files"] += removed
+        stats["image_bytes"] += reclaimed
+
+    return stats
+
+
+def compact_database(conn: sqlite3.Connection) -> Tuple[int, int]:
+    """
+    Release free pages and refresh planner statistics.
+    Returns the database size in bytes before and after.
+    """
+    cursor = conn.cursor()
+    size_before = _database_size(cursor)
+
+    auto_vacuum = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if auto_vacuum != 2:
+        # Conversión única a modo incremental; requiere un VACUUM completo
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+    else:
+        # Cada paso del pragma libera una sola página y execute() solo da un
+        # paso cuando no hay filas; executescript lo ejecuta hasta el final
+        conn.executescript("PRAGMA incremental_vacuum")
+
+    cursor.execute("ANALYZE")
+    conn.commit()
+
+    return size_before, _database_size(cursor)
+
+
+def run_maintenance(
+    db_path: str, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, int]:
+    """Remove stale images and compact the database. Returns reclaimed totals."""
+    conn = sqlite3.connect(db_path)
+
+    try:
+        stats = collect_stale_images(conn, batch_size)
+        size_before, size_after = compact_database(conn)
+        stats["database_size_before"] = size_before
+        stats["database_size_after"] = size_after
+        # ANALYZE puede crear sqlite_stat1 y hacer crecer la base de datos
+        stats["database_bytes"] = max(0, size_before - size_after)
+        return stats
+
+    finally:
+        conn.close()
+
+
+def print_maintenance_report(stats: Dict[str, int]):
+    if "legacy_files" in stats:
+        print(
+            f"Migrated {stats['legacy_files']} legacy images into shards, "
+            f"deleted {stats['superseded_files']} superseded ones, "
+            f"reclaimed {stats['superseded_bytes']} bytes"
+        )
+    print(f"Removed {stats['image_rows']} stale image records")
+    print(
+        f"Deleted {stats['image_files']} files, "
+        f"reclaimed {stats['image_bytes']} bytes"
+    )
+    print(
+        f"Database size {stats['database_size_before']} -> "
+        f"{stats['database_size_after']} bytes, "
+        f"reclaimed {stats['database_bytes']} bytes"
+    )
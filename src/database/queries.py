@@ -0,0 +1,176 @@
+# src/database/queries.py
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+PRODUCT_COLUMNS = [
+    "product_id",
+    "name",
+    "description",
+    "price",
+    "image_url",
+    "sale_price",
+    "out_of_stock",
+    "categories",
+    "source_url",
+    "updated_at",
+]
+
+_SELECT = f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM products"
+
+# Formas de consulta fijas: sqlite3 reutiliza el statement preparado por texto SQL
+QUERY_BY_ID = f"{_SELECT} WHERE product_id = ?"
+QUERY_BY_CATEGORY = (
+    f"{_SELECT} WHERE categories LIKE ? ORDER BY price DESC, name ASC LIMIT ? OFFSET ?"
+)
+QUERY_BY_PRICE_RANGE = (
+    f"{_SELECT} WHERE price BETWEEN ? AND ? ORDER BY price ASC, name ASC LIMIT ?"
+)
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class LRUCache:
+    """
+    Thread-safe bounded LRU cache.
+    Every entry is stored with the generation it was read at; invalidate()
+    bumps the generation, so entries read before it are never served.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._data: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _invalidate(self):
+        self.generation += 1
+        self._data.clear()
+
+    def invalidate(self):
+        with self._lock:
+            self._invalidate()
+
+    def get(self, key: Tuple, generation: int) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] == generation == self.generation:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple, value: Any, generation: int):
+        with self._lock:
+            # Resultados leídos antes de una invalidación se descartan
+            if generation != self.generation:
+                return
+            self._data[key] = (generation, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        self.invalidate()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ProductQueries:
+    """
+    Read-only lookups over the products database.
+    Each thread reuses its own read-only connection, and results are kept in
+    an LRU cache that is invalidated whenever another connection commits a
+    change, as seen by PRAGMA data_version on the thread's own connection.
+    """
+
+    def __init__(self, db_name: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.db_name = db_name
+        self.cache = LRUCache(cache_size)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.db_name}?mode=ro", uri=True, check_same_thread=False
+        )
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.version = None
+        return conn
+
+    def _current_generation(self, conn: sqlite3.Connection) -> int:
+        """
+        Return the cache generation for the current database state.
+        data_version is only comparable on a single connection, so each
+        thread keeps its own baseline and invalidates the shared cache when
+        its value changes. A new connection has no baseline and invalidates
+        too, since writes made before it existed are invisible to it.
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._local.version:
+            self.cache.invalidate()
+            self._local.version = version
+        return self.cache.generation
+
+    def _cached_query(
+        self, key: Tuple, sql: str, params: Tuple
+    ) -> List[Dict[str, Any]]:
+        conn = self._get_connection()
+        generation = self._current_generation(conn)
+
+        found, rows = self.cache.get(key, generation)
+        if not found:
+            rows = [
+                dict(zip(PRODUCT_COLUMNS, row)) for row in conn.execute(sql, params)
+            ]
+            self.cache.put(key, rows, generation)
+        return [dict(row) for row in rows]
+
+    def get_product(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Return a product by id, or None if it does not exist."""
+        rows = self._cached_query(("id", product_id), QUERY_BY_ID, (product_id,))
+        return rows[0] if rows else None
+
+    def get_category_page(
+        self, category: str, page: int = 1, page_size: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Return one page of products in a category, sorted by price descending."""
+        offset = (page - 1) * page_size
+        return self._cached_query(
+            ("category", category, page, page_size),
+            QUERY_BY_CATEGORY,
+            (f"%{category}%", page_size, offset),
+        )
+
+    def get_price_range(
+        self, min_price: float, max_price: float, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Return products priced between min_price and max_price, cheapest first."""
+        return self._cached_query(
+            ("price", min_price, max_price, limit),
+            QUERY_BY_PRICE_RANGE,
+            (min_price, max_price, limit),
+        )
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
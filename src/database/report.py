@@ -2,6 +2,7 @@ import sqlite3
 import csv
 import sys
 import os
+from typing import Optional
 
 
 def get_project_root():
@@ -18,9 +19,12 @@ def get_db_path():
     return os.path.join(get_project_root(), "products.db")
 
 
-def query_products():
-    """Query products by category and display them in CSV format."""
-    db_path = get_db_path()
+def query_products(db_path: Optional[str] = None):
+    """
+    Query products by category and display them in CSV format.
+    db_path defaults to products.db in the project root.
+    """
+    db_path = db_path or get_db_path()
 
     if not os.path.exists(db_path):
         print(f"Error: Database does not exist at {db_path}")
@@ -2,10 +2,10 @@
 
 import os
 import time
-from scraper.product_scraper import ProductScraper
+from typing import Optional
 from database.db_manager import DatabaseManager
 from database.report import query_products
-from utils.image_processor import ImageProcessor
+from utils.profiling import StageProfiler
 import config
 
 
@@ -19,68 +19,141 @@ def should_process_images(db_manager: DatabaseManager, product: dict) -> bool:
     return existing_product["image_url"] != product["image_url"]
 
 
-def main():
+def process_product_images(image_processor, product: dict):
+    """Download a product's image and process it into the configured sizes."""
+    if not (product["categories"] and product["image_url"]):
+        return
+
+    categories = product["categories"].split(",")
+    for category in categories:
+        category = category.strip()
+        if not category:
+            continue
+
+    # Download raw image
+    image_path = image_processor.download_image(
+        product["image_url"],
+        category,
+        product["product_id"],
+        config.HEADERS,
+    )
+
+    # Process image into different sizes
+    if image_path:
+        image_processor.process_image(
+            image_path,
+            category,
+            product["product_id"],
+            config.IMAGE_SIZES,
+            source_url=product["image_url"],
+        )
+
+
+def create_image_processor(
+    session=None, db_manager: Optional[DatabaseManager] = None
+):
+    """Build an ImageProcessor, importing the imaging stack only when needed."""
+    from utils.image_processor import ImageProcessor
+
+    if session is None:
+        import requests
+
+        session = requests.Session()
+    return ImageProcessor(
+        config.RAW_IMAGES_FOLDER,
+        config.PROCESSED_IMAGES_FOLDER,
+        session,
+        letterbox=config.LETTERBOX_IMAGES,
+        db_manager=db_manager,
+    )
+
+
+def migrate_legacy_images(image_processor):
+    """Move images from the pre-sharding flat layout into shards and record them."""
+    stats = image_processor.migrate_legacy_files()
+    if stats["legacy_files"] or stats["superseded_files"]:
+        print(
+            f"Migrated {stats['legacy_files']} legacy images, deleted "
+            f"{stats['superseded_files']} superseded ones"
+        )
+    return stats
+
+
+def crawl(process_images: bool = True, profiler: Optional[StageProfiler] = None):
+    """
+    Scrape every page, store changed products and optionally process images.
+    When a profiler is given, the crawl, db and images stages are profiled.
+    """
+    # Importaciones pesadas solo cuando se hace scraping
+    from scraper.product_scraper import ProductScraper
+
+    profiler = profiler or StageProfiler(enabled=False)
+
     # Initialize components
     scraper = ProductScraper(config.BASE_URL)
     db_manager = DatabaseManager(config.DB_NAME)
-    image_processor = ImageProcessor(
-        config.RAW_IMAGES_FOLDER, config.PROCESSED_IMAGES_FOLDER, scraper.session
-    )
+    image_processor = None
+    if process_images:
+        image_processor = create_image_processor(scraper.session, db_manager)
 
     # Setup database
     db_manager.setup_database()
+    if image_processor:
+        migrate_legacy_images(image_processor)
 
     # Fetch and process all pages
     page = 1
     while True:
-        products = scraper.fetch_products(page)
+        with profiler.stage("crawl"):
+            products = scraper.fetch_products(page)
         if not products:
             break
 
         for product in products:
-            # Check if product needs to be updated
-            existing_product = db_manager.get_existing_product(product["product_id"])
+            with profiler.stage("db"):
+                # store_product compara con la fila guardada (conservando el
+                # precio si el nuevo no es válido) y devuelve False si no cambia
+                stored = db_manager.store_product(product)
 
-            if existing_product and db_manager.are_products_equal(
-                existing_product, product
-            ):
-                print(f"Skipping unchanged product: {product['product_id']}")
+            if not stored:
                 continue
-            else:
-                # Store in database
-                db_manager.store_product(product)
-
-                # Process images if categories exist and images need processing
-                if product["categories"] and product["image_url"]:
-                    categories = product["categories"].split(",")
-                    for category in categories:
-                        category = category.strip()
-                        if not category:
-                            continue
-
-                    # Download raw image
-                    image_path = image_processor.download_image(
-                        product["image_url"],
-                        category,
-                        product["product_id"],
-                        config.HEADERS,
-                    )
-
-                    # Process image into different sizes
-                    if image_path:
-                        image_processor.process_image(
-                            image_path,
-                            category,
-                            product["product_id"],
-                            config.IMAGE_SIZES,
-                        )
+
+            # Process images if categories exist and images need processing
+            if image_processor:
+                with profiler.stage("images"):
+                    process_product_images(image_processor, product)
 
         print(f"Processed page {page}")
         page += 1
         time.sleep(config.REQUEST_DELAY)  # Be nice to the server
 
+
+def process_stored_images(profiler: Optional[StageProfiler] = None):
+    """Download and process images for every product already in the database."""
+    from database.export import EXPORT_COLUMNS, iter_product_batches
+
+    profiler = profiler or StageProfiler(enabled=False)
+
+    db_manager = DatabaseManager(config.DB_NAME)
+    db_manager.setup_database()
+    image_processor = create_image_processor(db_manager=db_manager)
+    migrate_legacy_images(image_processor)
+    # Leer todo antes de escribir: un cursor abierto bloquearía los commits
+    products = [
+        dict(zip(EXPORT_COLUMNS, row))
+        for rows in iter_product_batches(config.DB_NAME)
+        for row in rows
+    ]
+    for product in products:
+        with profiler.stage("images"):
+            process_product_images(image_processor, product)
+
+
+def main():
+    crawl()
+
     # Query and display results
-    query_products()
+    query_products(config.DB_NAME)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+# src/scraper/price_parser.py
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence
+
+CURRENCY_SYMBOLS = {"€": "EUR", "$": "USD", "£": "GBP", "¥": "JPY"}
+
+# Una línea por precio, anclada: moneda opcional, número, moneda opcional.
+# Un número con separadores de miles exige grupos de tres cifras con el mismo
+# separador ("group"), y el decimal debe ser distinto; sin grupos admite un
+# único separador decimal. La alternativa final captura las líneas inválidas,
+# de modo que findall devuelve exactamente una tupla por línea
+PRICE_PATTERN = re.compile(
+    r"^[ \t]*(?:(?P<pre>[€$£¥]|[A-Z]{3})?[ \t]*(?P<sign>-)?"
+    r"(?P<number>\d{1,3}(?P<group>[., \t])\d{3}(?:(?P=group)\d{3})*"
+    r"(?:(?!(?P=group))[.,]\d+)?|\d+(?:[.,]\d+)?)"
+    r"[ \t]*(?P<post>[€$£¥]|[A-Z]{3})?[ \t]*|.*)$",
+    re.MULTILINE,
+)
+# Camino rápido: si la primera fila es "<moneda>1234.56" o "1234.56<moneda>",
+# se valida toda la página de una vez con ese mismo formato estricto
+FAST_ROW = re.compile(
+    r"(?P<pre>(?:[€$£¥]|[A-Z]{3}) ?)?\d+\.\d\d(?P<post> ?(?:[€$£¥]|[A-Z]{3}))?"
+)
+
+
+@lru_cache(maxsize=32)
+def _page_pattern(pre: str, post: str) -> Pattern:
+    row = rf"{re.escape(pre)}\d+\.\d\d{re.escape(post)}"
+    return re.compile(rf"(?:{row}\n)*{row}")
+
+
+def _normalize_uniform_page(
+    raw_prices: Sequence[Optional[str]],
+) -> Optional[Dict[str, List]]:
+    """
+    Parse a page where every price has the format of the first one, a
+    decimal with two digits and the same currency affix. Returns None if any
+    row differs, so the caller falls back to parsing row by row.
+    """
+    match = FAST_ROW.fullmatch(raw_prices[0] or "")
+    if not match or (match["pre"] and match["post"]) or None in raw_prices:
+        return None
+
+    pre, post = match["pre"] or "", match["post"] or ""
+    text = "\n".join(raw_prices)
+    if not _page_pattern(pre, post).fullmatch(text):
+        return None
+
+    # Cada línea ya está validada: quitar la moneda no puede unir números
+    if pre:
+        text = text.replace(pre, "")
+    if post:
+        text = text.replace(post, "")
+    numbers = text.split("\n")
+    if len(numbers) != len(raw_prices):
+        # Algún precio contenía un salto de línea
+        return None
+
+    code = (pre or post).strip()
+    currency = CURRENCY_SYMBOLS.get(code, code) or None
+    return {
+        "value": list(map(float, numbers)),
+        "currency": [currency] * len(numbers),
+        "valid": [True] * len(numbers),
+    }
+
+
+def normalize_prices(raw_prices: Sequence[Optional[str]]) -> Dict[str, List]:
+    """
+    Parse all the raw price strings of a page at once.
+    Returns parallel lists "value" (float or None), "currency" and "valid".
+    Each row is matched on its own and its currency comes from its own prefix
+    or suffix. Missing prices (None) are valid with value None; strings that
+    cannot be parsed are flagged with valid=False instead of raising.
+    """
+    if not raw_prices:
+        return {"value": [], "currency": [], "valid": []}
+
+    uniform = _normalize_uniform_page(raw_prices)
+    if uniform:
+        return uniform
+
+    text = "\n".join(raw.replace("\n", " ") if raw else "" for raw in raw_prices)
+    matches = PRICE_PATTERN.findall(text.replace("\xa0", " "))
+
+    # Una columna cada vez. Tras validar el formato, quitar el separador de
+    # miles y cambiar la coma decimal por punto da un literal para float()
+    valid = [
+        raw is None or (bool(number) and not (pre and post))
+        for raw, (pre, _, number, _, post) in zip(raw_prices, matches)
+    ]
+    values = [
+        float(sign + number.replace(group, "").replace(",", "."))
+        if ok and number
+        else None
+        for ok, (_, sign, number, group, _) in zip(valid, matches)
+    ]
+    currencies = [
+        CURRENCY_SYMBOLS.get(pre or post, pre or post) or None
+        if value is not None
+        else None
+        for value, (pre, _, _, _, post) in zip(values, matches)
+    ]
+    return {"value": values, "currency": currencies, "valid": valid}
@@ -4,6 +4,7 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 import time
+from .price_parser import normalize_prices
 
 
 class ProductScraper:
@@ -13,6 +14,16 @@ class ProductScraper:
 
     def parse_product_data(self, product_elem) -> Optional[Dict]:
         """Extract product data from HTML element."""
+        product = self.parse_product_fields(product_elem)
+        if product:
+            self.apply_prices([product])
+        return product
+
+    def parse_product_fields(self, product_elem) -> Optional[Dict]:
+        """
+        Extract product data from HTML element, keeping the price as raw text
+        in "price_text" so a whole page can be normalized at once.
+        """
         try:
             # Get product ID from href
             product_link = product_elem.find("a", class_="card-header")
@@ -29,7 +40,6 @@ class ProductScraper:
             # Extract price
             price_elem = product_elem.find("div", class_="price-wrapper")
             price_text = price_elem.text.strip() if price_elem else "0"
-            price = float(price_text.replace("€", "").replace(",", ".").strip())
 
             # Extract categories
             categories = []
@@ -55,9 +65,11 @@ class ProductScraper:
                 "product_id": product_id,
                 "name": name,
                 "description": description,
-                "price": price,
+                "price": None,
+                "price_text": price_text,
                 "image_url": image_url,
                 "sale_price": None,  # Not available in current data
+                "sale_price_text": None,
                 "out_of_stock": False,  # Not available in current data
                 "categories": ",".join(categories),
                 "source_url": source_url,
@@ -66,6 +78,26 @@ class ProductScraper:
             print(f"Error parsing product: {str(e)}")
             return None
 
+    @staticmethod
+    def apply_prices(products: List[Dict]):
+        """
+        Normalize the raw prices of all products together and set "price",
+        "sale_price", "currency" and "price_valid". Products with a price
+        that cannot be parsed are kept and flagged instead of dropped.
+        """
+        prices = normalize_prices([p.pop("price_text", None) for p in products])
+        sale_prices = normalize_prices(
+            [p.pop("sale_price_text", None) for p in products]
+        )
+
+        for i, product in enumerate(products):
+            product["price"] = prices["value"][i]
+            product["sale_price"] = sale_prices["value"][i]
+            product["currency"] = prices["currency"][i] or sale_prices["currency"][i]
+            product["price_valid"] = prices["valid"][i] and sale_prices["valid"][i]
+            if not product["price_valid"]:
+                print(f"Invalid price for product: {product['product_id']}")
+
     def fetch_products(self, page: int = 1) -> List[Dict]:
         """Fetch products from a specific page."""
         try:
@@ -78,10 +110,11 @@ class ProductScraper:
 
             products = []
             for card in product_cards:
-                product_data = self.parse_product_data(card)
+                product_data = self.parse_product_fields(card)
                 if product_data:
                     products.append(product_data)
 
+            self.apply_prices(products)
             return products
 
         except requests.RequestException as e:
@@ -1,19 +1,47 @@
 # src/utils/image_processor.py
 
 import os
+import re
+import hashlib
+from itertools import islice
 from PIL import Image
 from io import BytesIO
 import requests
-from typing import Tuple, List
+from typing import Any, Dict, Optional, Tuple, List
+
+# Nombres de fichero de la estructura plana anterior a los shards
+LEGACY_ORIGINAL = re.compile(r"^(?P<stem>.+?)(?:_original|\.svg)$")
+LEGACY_DERIVATIVE = re.compile(r"^(?P<stem>.+)_(?P<width>\d+)x(?P<height>\d+)\.jpg$")
 
 
 class ImageProcessor:
     def __init__(
-        self, raw_folder: str, processed_folder: str, session: requests.Session
+        self,
+        raw_folder: str,
+        processed_folder: str,
+        session: requests.Session,
+        letterbox: bool = True,
+        db_manager=None,
     ):
         self.raw_folder = raw_folder
         self.processed_folder = processed_folder
         self.session = session
+        # Si es False, se guardan las miniaturas sin relleno y el cliente
+        # aplica el letterbox usando las dimensiones y offsets devueltos
+        self.letterbox = letterbox
+        # DatabaseManager opcional donde se registra cada imagen en la tabla images
+        self.db_manager = db_manager
+        self._canvases: Dict[Tuple[int, int], Image.Image] = {}
+
+    def _get_canvas(self, size: Tuple[int, int]) -> Image.Image:
+        """Return a white canvas of the given size, reusing one per size."""
+        canvas = self._canvases.get(size)
+        if canvas is None:
+            canvas = Image.new("RGB", size, (255, 255, 255))
+            self._canvases[size] = canvas
+        else:
+            canvas.paste((255, 255, 255), (0, 0) + size)
+        return canvas
 
     @staticmethod
     def sanitize_filename(filename: str) -> str:
@@ -26,36 +54,225 @@ class ImageProcessor:
         sanitized = "".join(c for c in sanitized if c.isalnum() or c in "_-")
         return sanitized
 
+    @staticmethod
+    def shard_folder(folder: str, product_id: str) -> str:
+        """
+        Return the shard directory for a product inside folder.
+        Files are spread over 256 subdirectories keyed by a hash of the
+        product id, so no single directory grows too large.
+        """
+        shard = hashlib.md5(str(product_id).encode("utf-8")).hexdigest()[:2]
+        return os.path.join(folder, shard)
+
+    def _store_records(self, records: List[Dict[str, Any]]):
+        if self.db_manager and records:
+            self.db_manager.store_image_records(records)
+
+    def _find_original(self, product_id: str, image_url: str) -> Optional[str]:
+        """Return the path of an already downloaded original, if still on disk."""
+        if not self.db_manager:
+            return None
+        for image in self.db_manager.get_images(product_id, kind="original"):
+            if image["source_url"] == image_url and os.path.exists(image["path"]):
+                return image["path"]
+        return None
+
+    def _link_duplicate(self, content_hash: str, filepath: str) -> bool:
+        """
+        Hard-link filepath to a recorded file with the same content, so
+        identical images are stored once. Returns False if there is none.
+        """
+        if not self.db_manager:
+            return False
+        for image in self.db_manager.find_images_by_hash(content_hash):
+            if image["path"] == filepath or not os.path.exists(image["path"]):
+                continue
+            try:
+                os.link(image["path"], filepath)
+            except OSError:
+                return False
+            print(f"Linked duplicate image: {filepath} -> {image['path']}")
+            return True
+        return False
+
+    def _file_record(
+        self, path: str, product_id: str, kind: str, source_url: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build an images record for a file that is already on disk."""
+        with open(path, "rb") as f:
+            content = f.read()
+        record = {
+            "path": path,
+            "product_id": product_id,
+            "kind": kind,
+            "source_url": source_url,
+            "format": "SVG" if path.endswith(".svg") else None,
+            "bytes": len(content),
+            "content_hash": hashlib.sha256(content).hexdigest(),
+        }
+        if not record["format"]:
+            try:
+                with Image.open(BytesIO(content)) as img:
+                    record["format"] = img.format
+                    record["width"], record["height"] = img.size
+            except Exception:
+                pass
+        return record
+
+    def migrate_legacy_files(self, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Move files left in the flat layout used before sharding into their
+        shard folder and record them in the images table. Files are matched
+        to stored products by name; files of unknown products are left in
+        place. A legacy file whose shard path already holds a newer file is
+        superseded and deleted.
+        """
+        stats = {"legacy_files": 0, "superseded_files": 0, "superseded_bytes": 0}
+        if not self.db_manager:
+            return stats
+
+        for folder, kind, pattern in [
+            (self.raw_folder, "original", LEGACY_ORIGINAL),
+            (self.processed_folder, "derivative", LEGACY_DERIVATIVE),
+        ]:
+            if not os.path.isdir(folder):
+                continue
+            # Listar antes de mover: no se modifica el directorio mientras se lee
+            names = iter([e.name for e in os.scandir(folder) if e.is_file()])
+            while True:
+                batch = list(islice(names, batch_size))
+                if not batch:
+                    break
+                matches = {name: pattern.match(name) for name in batch}
+                candidates = {
+                    name: self._legacy_product_ids(match.group("stem"))
+                    for name, match in matches.items()
+                    if match
+                }
+                image_urls = self.db_manager.get_product_image_urls(
+                    sorted({pid for pids in candidates.values() for pid in pids})
+                )
+
+                records = []
+                for name, product_ids in candidates.items():
+                    product_id = next((p for p in product_ids if p in image_urls), None)
+                    if product_id is None:
+                        continue
+                    record = self._migrate_legacy_file(
+                        folder, matches[name], product_id, kind, stats
+                    )
+                    if record:
+                        record["source_url"] = image_urls[product_id]
+                        records.append(record)
+                self._store_records(records)
+
+        return stats
+
+    @staticmethod
+    def _legacy_product_ids(stem: str) -> List[str]:
+        # stem es "<categoría>_<product_id>" y ambos pueden contener "_":
+        # candidatos de más largo a más corto
+        return [stem[i + 1 :] for i, char in enumerate(stem) if char == "_"]
+
+    def _migrate_legacy_file(
+        self,
+        folder: str,
+        match: "re.Match[str]",
+        product_id: str,
+        kind: str,
+        stats: Dict[str, int],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Move one legacy file into its shard and return its images record.
+        If the shard already holds a file with the same name, the legacy copy
+        is older and is deleted instead.
+        """
+        source = os.path.join(folder, match.string)
+        shard = self.shard_folder(folder, product_id)
+        target = os.path.join(shard, match.string)
+        try:
+            if os.path.exists(target):
+                size = os.path.getsize(source)
+                os.remove(source)
+                stats["superseded_files"] += 1
+                stats["superseded_bytes"] += size
+                return None
+
+            os.makedirs(shard, exist_ok=True)
+            os.replace(source, target)
+            stats["legacy_files"] += 1
+            record = self._file_record(target, product_id, kind, None)
+            if kind == "derivative":
+                record["target_width"] = int(match.group("width"))
+                record["target_height"] = int(match.group("height"))
+                record["offset_x"] = record["offset_y"] = 0
+            return record
+
+        except OSError as e:
+            print(f"Error migrating image {source}: {str(e)}")
+            return None
+
     def download_image(
         self, image_url: str, category: str, product_id: str, headers: dict
     ) -> str:
         """Download image and return the path where it was saved."""
         try:
+            existing_path = self._find_original(product_id, image_url)
+            if existing_path:
+                print(f"Image already downloaded: {existing_path}")
+                return existing_path
+
             print(f"Downloading image from: {image_url}")
             response = self.session.get(image_url, headers=headers)
             response.raise_for_status()
 
-            os.makedirs(self.raw_folder, exist_ok=True)
+            folder = self.shard_folder(self.raw_folder, product_id)
+            os.makedirs(folder, exist_ok=True)
             safe_category = self.sanitize_filename(category)
+            content = response.content
+
+            record = {
+                "path": None,
+                "product_id": product_id,
+                "kind": "original",
+                "source_url": image_url,
+                "format": None,
+                "width": None,
+                "height": None,
+                "bytes": len(content),
+                "content_hash": hashlib.sha256(content).hexdigest(),
+            }
 
             # Handle SVG images
             if (
                 "svg" in response.headers.get("content-type", "").lower()
-                or response.content.startswith(b"<?xml")
-                or response.content.startswith(b"<svg")
+                or content.startswith(b"<?xml")
+                or content.startswith(b"<svg")
             ):
 
                 filename = f"{safe_category}_{product_id}.svg"
-                filepath = os.path.join(self.raw_folder, filename)
+                record["format"] = "SVG"
+            else:
+                # Handle regular images
+                filename = f"{safe_category}_{product_id}_original"
+                try:
+                    # Solo lee la cabecera, no decodifica la imagen completa
+                    with Image.open(BytesIO(content)) as img:
+                        record["format"] = img.format
+                        record["width"], record["height"] = img.size
+                except Exception:
+                    pass
+
+            filepath = os.path.join(folder, filename)
+            # Borrar antes de escribir: el fichero puede ser un enlace a otro
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            if not self._link_duplicate(record["content_hash"], filepath):
                 with open(filepath, "wb") as f:
-                    f.write(response.content)
-                return filepath
-
-            # Handle regular images
-            filename = f"{safe_category}_{product_id}_original"
-            filepath = os.path.join(self.raw_folder, filename)
-            with open(filepath, "wb") as f:
-                f.write(response.content)
+                    f.write(content)
+
+            record["path"] = filepath
+            self._store_records([record])
             return filepath
 
         except Exception as e:
@@ -68,33 +285,71 @@ class ImageProcessor:
         category: str,
         product_id: str,
         sizes: List[Tuple[int, int]],
-    ):
-        """Process downloaded image into required sizes."""
+        source_url: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process downloaded image into required sizes.
+        Returns one record per saved file with its path, the target size, the
+        dimensions of the scaled image, its offset inside the target box and
+        its format, byte size and content hash.
+        """
+        placements = []
         try:
             if not image_path or image_path.endswith(".svg"):
-                return
+                return placements
 
             img = Image.open(image_path)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
             safe_category = self.sanitize_filename(category)
-            os.makedirs(self.processed_folder, exist_ok=True)
+            folder = self.shard_folder(self.processed_folder, product_id)
+            os.makedirs(folder, exist_ok=True)
 
             for size in sizes:
                 img_copy = img.copy()
-                if img_copy.mode != "RGB":
-                    img_copy = img_copy.convert("RGB")
 
                 # Resize maintaining aspect ratio
                 img_copy.thumbnail(size, Image.Resampling.LANCZOS)
-
-                # Create new image with exact dimensions
-                new_img = Image.new("RGB", size, (255, 255, 255))
                 x = (size[0] - img_copy.size[0]) // 2
                 y = (size[1] - img_copy.size[1]) // 2
-                new_img.paste(img_copy, (x, y))
 
                 filename = f"{safe_category}_{product_id}_{size[0]}x{size[1]}.jpg"
-                filepath = os.path.join(self.processed_folder, filename)
-                new_img.save(filepath, "JPEG", quality=85)
+                filepath = os.path.join(folder, filename)
+
+                if self.letterbox:
+                    # Paste into a reused canvas with exact dimensions
+                    new_img = self._get_canvas(size)
+                    new_img.paste(img_copy, (x, y))
+                else:
+                    new_img = img_copy
+
+                # Codificar en memoria para obtener tamaño y hash sin releer
+                buffer = BytesIO()
+                new_img.save(buffer, "JPEG", quality=85)
+                content = buffer.getvalue()
+                with open(filepath, "wb") as f:
+                    f.write(content)
+
+                placements.append(
+                    {
+                        "path": filepath,
+                        "product_id": product_id,
+                        "kind": "derivative",
+                        "source_url": source_url,
+                        "format": "JPEG",
+                        "width": img_copy.size[0],
+                        "height": img_copy.size[1],
+                        "bytes": len(content),
+                        "content_hash": hashlib.sha256(content).hexdigest(),
+                        "target_width": size[0],
+                        "target_height": size[1],
+                        "offset_x": x,
+                        "offset_y": y,
+                    }
+                )
 
         except Exception as e:
             print(f"Error processing image for product {product_id}: {str(e)}")
+
+        self._store_records(placements)
+        return placements
@@ -0,0 +1,121 @@
+# src/utils/profiling.py
+
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class StageProfiler:
+    """
+    Collect cProfile stats and tracemalloc allocations per named stage.
+
+    Wrap each stage with `with profiler.stage("db"):`. Only a fraction of the
+    calls to each stage (sample_rate) are measured, and a disabled profiler
+    adds no overhead. Stages must not be nested.
+    """
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 1.0, top: int = 25):
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.top = top
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._allocations: Dict[str, Dict[str, int]] = {}
+        self._calls: Dict[str, int] = {}
+        self._samples: Dict[str, int] = {}
+        self._active: Optional[str] = None
+
+    def _should_sample(self, name: str) -> bool:
+        # Muestreo determinista: se mide una de cada 1/sample_rate llamadas
+        calls = self._calls.get(name, 0) + 1
+        self._calls[name] = calls
+        return int(calls * self.sample_rate) > int((calls - 1) * self.sample_rate)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled or self._active or not self._should_sample(name):
+            yield
+            return
+
+        # Trazar solo durante la etapa: al salir, lo que sigue trazado es
+        # exactamente lo que la etapa ha retenido
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        self._active = name
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            self._active = None
+            self._samples[name] = self._samples.get(name, 0) + 1
+            self._record_allocations(name, self._filter(snapshot).statistics("lineno"))
+
+    @staticmethod
+    def _filter(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        # Excluir las asignaciones del propio profiler
+        return snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+
+    def _record_allocations(
+        self, name: str, statistics: List[tracemalloc.Statistic]
+    ):
+        allocations = self._allocations.setdefault(name, {})
+        for stat in statistics:
+            location = str(stat.traceback)
+            allocations[location] = allocations.get(location, 0) + stat.size
+
+    def summary(self, name: str) -> str:
+        """Return a text summary of the CPU and memory profile of a stage."""
+        output = io.StringIO()
+        calls = self._calls.get(name, 0)
+        samples = self._samples.get(name, 0)
+        output.write(f"Stage: {name}\nCalls: {calls}, sampled: {samples}\n\n")
+
+        output.write("Top functions by cumulative time:\n")
+        stats = pstats.Stats(self._profiles[name], stream=output)
+        stats.sort_stats("cumulative").print_stats(self.top)
+
+        output.write("Top allocations (bytes retained after the stage):\n")
+        allocations = sorted(
+            self._allocations.get(name, {}).items(), key=lambda item: -item[1]
+        )
+        for location, size in allocations[: self.top]:
+            output.write(f"{size:>12}  {location}\n")
+
+        return output.getvalue()
+
+    def write(self, output_dir: str) -> List[str]:
+        """
+        Write <stage>.prof and <stage>.txt for every profiled stage.
+        Returns the paths of the written files.
+        """
+        if not self._profiles:
+            return []
+
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for name, profile in self._profiles.items():
+            prof_path = os.path.join(output_dir, f"{name}.prof")
+            profile.dump_stats(prof_path)
+
+            summary_path = os.path.join(output_dir, f"{name}.txt")
+            with open(summary_path, "w", encoding="utf-8") as f:
+                f.write(self.summary(name))
+
+            written.extend([prof_path, summary_path])
+        return written
@@ -0,0 +1,103 @@
+# tests/test_cli.py
+import os
+import sys
+import json
+import subprocess
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+# Presupuesto de importación para entradas cortas (report/export)
+IMPORT_BUDGET_SECONDS = 0.1
+HEAVY_MODULES = ["requests", "bs4", "PIL"]
+
+
+def run_in_src(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_cli_import_is_lightweight():
+    """Test that the CLI starts without heavy dependencies and within budget."""
+    output = run_in_src(
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        "import cli\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    stats = json.loads(output)
+
+    assert stats["heavy"] == []
+    assert stats["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_export_command(tmp_path):
+    """Test that the export command runs without loading the scraping stack."""
+    db_path = str(tmp_path / "cli.db")
+    output_path = str(tmp_path / "out.csv")
+    output = run_in_src(
+        "import sys\n"
+        "from database.db_manager import DatabaseManager\n"
+        "import cli\n"
+        f"DatabaseManager({db_path!r}).setup_database()\n"
+        f"code = cli.main(['export', {output_path!r}, '--db', {db_path!r}])\n"
+        f"assert not any(m in sys.modules for m in {HEAVY_MODULES!r})\n"
+        "sys.exit(code)\n"
+    )
+
+    assert "Exported 0 products" in output
+    assert os.path.exists(output_path)
+
+
+def test_report_uses_configured_database(tmp_path, mock_product_data):
+    """Test that report reads the same database as the other commands."""
+    db_path = str(tmp_path / "cli.db")
+    output = run_in_src(
+        "import config\n"
+        "from database.db_manager import DatabaseManager\n"
+        "import cli\n"
+        f"config.DB_NAME = {db_path!r}\n"
+        "manager = DatabaseManager(config.DB_NAME)\n"
+        "manager.setup_database()\n"
+        f"manager.store_product({mock_product_data!r})\n"
+        "cli.main(['report'])\n"
+    )
+
+    assert "Database does not exist" not in output
+    assert "test123" in output
+
+
+def test_crawl_skips_images_of_unchanged_invalid_price(tmp_path, mock_product_data):
+    """Test that a product whose price cannot be parsed is not reprocessed."""
+    script = (
+        "from unittest.mock import Mock, patch\n"
+        "import config, main\n"
+        "from database.db_manager import DatabaseManager\n"
+        f"config.DB_NAME = {str(tmp_path / 'crawl.db')!r}\n"
+        f"config.RAW_IMAGES_FOLDER = {str(tmp_path / 'raw')!r}\n"
+        f"config.PROCESSED_IMAGES_FOLDER = {str(tmp_path / 'processed')!r}\n"
+        "config.REQUEST_DELAY = 0\n"
+        f"product = {mock_product_data!r}\n"
+        "manager = DatabaseManager(config.DB_NAME)\n"
+        "manager.setup_database()\n"
+        "manager.store_product(product)\n"
+        "scraper = Mock()\n"
+        "scraper.fetch_products.side_effect = [\n"
+        "    [dict(product, price=None, price_valid=False)], []\n"
+        "]\n"
+        "with patch('scraper.product_scraper.ProductScraper', return_value=scraper),"
+        " patch('main.process_product_images') as process:\n"
+        "    main.crawl()\n"
+        "print('processed', process.call_count)\n"
+    )
+
+    assert "processed 0" in run_in_src(script)
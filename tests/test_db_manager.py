@@ -44,3 +44,126 @@ def test_store_and_get_product(db_manager, mock_product_data):
     assert stored_product is not None
     assert stored_product["name"] == mock_product_data["name"]
     assert stored_product["price"] == mock_product_data["price"]
+
+
+def test_store_image_records(db_manager):
+    """Test storing image metadata and reading placements back."""
+    original = {
+        "path": "product_raw_images/ab/test_image1_original",
+        "product_id": "image1",
+        "kind": "original",
+        "source_url": "https://example.com/image.jpg",
+        "format": "JPEG",
+        "width": 800,
+        "height": 600,
+        "bytes": 12345,
+        "content_hash": "abc123",
+    }
+    derivative = {
+        "path": "product_images/ab/test_image1_500x500.jpg",
+        "product_id": "image1",
+        "kind": "derivative",
+        "source_url": "https://example.com/image.jpg",
+        "format": "JPEG",
+        "width": 500,
+        "height": 375,
+        "bytes": 2345,
+        "content_hash": "def456",
+        "target_width": 500,
+        "target_height": 500,
+        "offset_x": 0,
+        "offset_y": 62,
+    }
+
+    assert db_manager.store_image_records([original, derivative]) is True
+
+    assert len(db_manager.get_images("image1")) == 2
+    assert db_manager.get_images("image1", kind="original")[0]["bytes"] == 12345
+    assert db_manager.find_images_by_hash("def456")[0]["path"] == derivative["path"]
+    assert db_manager.get_image_placements("image1") == [
+        {
+            "path": derivative["path"],
+            "target_width": 500,
+            "target_height": 500,
+            "width": 500,
+            "height": 375,
+            "offset_x": 0,
+            "offset_y": 62,
+        }
+    ]
+
+
+def test_store_product_keeps_created_at(db_manager, mock_product_data):
+    """Test that updating a product preserves its created_at timestamp."""
+    product = dict(mock_product_data, product_id="upsert1")
+    db_manager.store_product(product)
+
+    conn = sqlite3.connect(db_manager.db_name)
+    conn.execute(
+        "UPDATE products SET created_at = '2020-01-01 00:00:00' "
+        "WHERE product_id = 'upsert1'"
+    )
+    conn.commit()
+
+    assert db_manager.store_product(dict(product, price=10.0)) is True
+
+    row = conn.execute(
+        "SELECT created_at, price FROM products WHERE product_id = 'upsert1'"
+    ).fetchone()
+    conn.close()
+    assert row == ("2020-01-01 00:00:00", 10.0)
+
+
+def test_invalid_price_keeps_stored_price(db_manager, mock_product_data):
+    """Test that a product with an unparseable price keeps its stored price."""
+    product = dict(mock_product_data, product_id="invalid1", price=10.0)
+    db_manager.store_product(product)
+    invalid = dict(product, price=None, sale_price=None, price_valid=False)
+
+    assert db_manager.store_product(invalid) is False
+    assert db_manager.store_product(dict(invalid, name="Renamed")) is True
+
+    conn = sqlite3.connect(db_manager.db_name)
+    row = conn.execute(
+        "SELECT name, price FROM products WHERE product_id = 'invalid1'"
+    ).fetchone()
+    conn.close()
+    assert row == ("Renamed", 10.0)
+
+
+def test_price_flag_and_currency_stored(db_manager, mock_product_data):
+    """Test that a new product with an invalid price is flagged, not just NULL."""
+    db_manager.store_product(
+        dict(mock_product_data, product_id="flag1", price=None, price_valid=False)
+    )
+    db_manager.store_product(
+        dict(mock_product_data, product_id="flag2", currency="EUR", price_valid=True)
+    )
+
+    invalid = db_manager.get_existing_product("flag1")
+    assert (invalid["price"], invalid["price_valid"]) == (None, False)
+    valid = db_manager.get_existing_product("flag2")
+    assert (valid["currency"], valid["price_valid"]) == ("EUR", True)
+
+
+def test_setup_adds_price_columns(tmp_path):
+    """Test that setup_database adds currency and price_valid to older tables."""
+    db_path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE products (product_id TEXT PRIMARY KEY, name TEXT NOT NULL, "
+        "description TEXT, price REAL, image_url TEXT, sale_price REAL, "
+        "out_of_stock INTEGER, categories TEXT, source_url TEXT, "
+        "created_at TIMESTAMP, updated_at TIMESTAMP)"
+    )
+    conn.execute(
+        "INSERT INTO products (product_id, name, price) VALUES ('old1', 'Old', 5)"
+    )
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager(db_path)
+    manager.setup_database()
+
+    old = manager.get_existing_product("old1")
+    assert (old["currency"], old["price_valid"]) == (None, True)
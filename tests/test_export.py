@@ -0,0 +1,145 @@
+# tests/test_export.py
+import os
+import sys
+import csv
+import gzip
+import json
+import sqlite3
+import pytest
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database.db_manager import DatabaseManager
+from src.database.export import export_products, run_export
+
+
+@pytest.fixture
+def populated_db(tmp_path, mock_product_data):
+    db_path = str(tmp_path / "export.db")
+    manager = DatabaseManager(db_path)
+    manager.setup_database()
+
+    manager.store_product(mock_product_data)
+    manager.store_product(dict(mock_product_data, product_id="test456"))
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "UPDATE products SET updated_at = '2024-01-01T00:00:00' "
+        "WHERE product_id = 'test123'"
+    )
+    conn.execute(
+        "UPDATE products SET updated_at = '2024-06-01T00:00:00' "
+        "WHERE product_id = 'test456'"
+    )
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def test_export_csv_snapshot(populated_db, tmp_path):
+    """Test full CSV snapshot streamed in small batches."""
+    output = str(tmp_path / "products.csv")
+    count = export_products(populated_db, output, fmt="csv", batch_size=1)
+
+    assert count == 2
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["product_id"] for row in rows] == ["test123", "test456"]
+
+
+def test_export_jsonl_delta_gzip(populated_db, tmp_path):
+    """Test incremental JSONL export with gzip compression."""
+    output = str(tmp_path / "delta.jsonl.gz")
+    count = export_products(
+        populated_db,
+        output,
+        fmt="jsonl",
+        since="2024-03-01T00:00:00",
+        compression="gzip",
+    )
+
+    assert count == 1
+    with gzip.open(output, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 1
+    assert records[0]["product_id"] == "test456"
+    assert records[0]["price"] == 99.99
+
+
+def test_export_invalid_format(populated_db, tmp_path):
+    """Test that unknown formats are rejected."""
+    with pytest.raises(ValueError):
+        export_products(populated_db, str(tmp_path / "out.xml"), fmt="xml")
+
+
+def test_export_jsonl_zstd(populated_db, tmp_path):
+    """Test JSONL export with zstd compression."""
+    zstandard = pytest.importorskip("zstandard")
+    output = str(tmp_path / "products.jsonl.zst")
+
+    assert export_products(populated_db, output, fmt="jsonl", compression="zstd") == 2
+
+    with open(output, "rb") as f:
+        data = zstandard.ZstdDecompressor().stream_reader(f).read()
+    records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+    assert [r["product_id"] for r in records] == ["test123", "test456"]
+
+
+def test_export_parquet(populated_db, tmp_path):
+    """Test Parquet export streamed in batches."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = str(tmp_path / "products.parquet")
+
+    count = export_products(
+        populated_db, output, fmt="parquet", compression="gzip", batch_size=1
+    )
+
+    assert count == 2
+    table = pq.read_table(output)
+    assert table.column("product_id").to_pylist() == ["test123", "test456"]
+    assert table.column("price").to_pylist() == [99.99, 99.99]
+
+
+@pytest.mark.parametrize(
+    "module, fmt, compression",
+    [("pyarrow.parquet", "parquet", None), ("zstandard", "jsonl", "zstd")],
+)
+def test_export_missing_optional_dependency(
+    populated_db, tmp_path, monkeypatch, module, fmt, compression
+):
+    """Test that a missing optional dependency raises ValueError."""
+    # Un None en sys.modules hace que el import falle con ImportError
+    monkeypatch.setitem(sys.modules, module, None)
+
+    with pytest.raises(ValueError):
+        export_products(
+            populated_db, str(tmp_path / "out"), fmt=fmt, compression=compression
+        )
+
+
+def export_args(db, output):
+    return {
+        "db": db,
+        "output": output,
+        "fmt": "csv",
+        "since": None,
+        "compression": None,
+        "batch_size": 100,
+    }
+
+
+def test_export_missing_database(tmp_path):
+    """Test that a missing database is reported without creating any file."""
+    db_path = tmp_path / "missing.db"
+    output = tmp_path / "out.csv"
+
+    assert run_export(export_args(str(db_path), str(output))) == 1
+    assert not db_path.exists()
+    assert not output.exists()
+
+
+def test_export_unwritable_output(populated_db, tmp_path):
+    """Test that an unwritable output path returns an error code."""
+    output = tmp_path / "missing_dir" / "out.csv"
+
+    assert run_export(export_args(populated_db, str(output))) == 1
@@ -41,3 +41,139 @@ def test_sanitize_filename(image_processor):
 
     for input_name, expected in test_cases:
         assert image_processor.sanitize_filename(input_name) == expected
+
+
+def test_process_image_letterbox(image_processor, sample_image, tmp_path):
+    """Test that letterboxed images keep the exact target size."""
+    image_path = tmp_path / "letterbox_original"
+    image_path.write_bytes(sample_image)
+
+    placements = image_processor.process_image(
+        str(image_path), "Electronics", "boxed1", [(100, 100), (500, 500)]
+    )
+
+    assert [p["target_width"] for p in placements] == [100, 500]
+    assert placements[0]["width"] == 100
+    assert placements[0]["height"] == 75
+    assert placements[0]["offset_y"] == 12
+    for placement in placements:
+        with Image.open(placement["path"]) as img:
+            assert img.size == (placement["target_width"], placement["target_height"])
+
+
+def test_process_image_without_letterbox(test_image_dirs, sample_image, tmp_path):
+    """Test that unpadded images are saved at their scaled size."""
+    raw_dir, processed_dir = test_image_dirs
+    processor = ImageProcessor(
+        raw_dir, processed_dir, requests.Session(), letterbox=False
+    )
+    image_path = tmp_path / "unpadded_original"
+    image_path.write_bytes(sample_image)
+
+    placements = processor.process_image(
+        str(image_path), "Electronics", "unpadded1", [(2000, 2000)]
+    )
+
+    assert len(placements) == 1
+    assert placements[0]["offset_x"] == 600
+    assert placements[0]["offset_y"] == 700
+    with Image.open(placements[0]["path"]) as img:
+        assert img.size == (800, 600)
+
+
+def test_images_recorded_in_database(test_image_dirs, sample_image, tmp_path):
+    """Test that originals and derivatives are stored sharded and recorded."""
+    from src.database.db_manager import DatabaseManager
+
+    db_manager = DatabaseManager(str(tmp_path / "images.db"))
+    db_manager.setup_database()
+    raw_dir, processed_dir = test_image_dirs
+    session = Mock()
+    session.get.return_value = Mock(
+        content=sample_image, headers={"content-type": "image/jpeg"}
+    )
+    processor = ImageProcessor(raw_dir, processed_dir, session, db_manager=db_manager)
+
+    image_url = "https://example.com/image.jpg"
+    image_path = processor.download_image(image_url, "Electronics", "db1", {})
+    assert os.path.dirname(image_path) == processor.shard_folder(raw_dir, "db1")
+    processor.process_image(
+        image_path, "Electronics", "db1", [(100, 100)], source_url=image_url
+    )
+
+    original = db_manager.get_images("db1", kind="original")[0]
+    assert original["format"] == "JPEG"
+    assert (original["width"], original["height"]) == (800, 600)
+    assert original["bytes"] == len(sample_image)
+    derivative = db_manager.get_images("db1", kind="derivative")[0]
+    assert derivative["bytes"] == os.path.getsize(derivative["path"])
+    assert derivative["source_url"] == image_url
+
+    # A second download of the same URL reuses the recorded original
+    assert processor.download_image(image_url, "Electronics", "db1", {}) == image_path
+    assert session.get.call_count == 1
+
+
+def test_duplicate_originals_are_linked(test_image_dirs, sample_image, tmp_path):
+    """Test that an original with a recorded hash is linked, not stored twice."""
+    from src.database.db_manager import DatabaseManager
+
+    db_manager = DatabaseManager(str(tmp_path / "dedup.db"))
+    db_manager.setup_database()
+    raw_dir, processed_dir = test_image_dirs
+    session = Mock()
+    session.get.return_value = Mock(content=sample_image, headers={})
+    processor = ImageProcessor(raw_dir, processed_dir, session, db_manager=db_manager)
+
+    first = processor.download_image("https://a.example.com/x.jpg", "Toys", "d1", {})
+    second = processor.download_image("https://b.example.com/y.jpg", "Toys", "d2", {})
+
+    assert os.path.samefile(first, second)
+    content_hash = db_manager.get_images("d2")[0]["content_hash"]
+    assert len(db_manager.find_images_by_hash(content_hash)) == 2
+
+
+def test_migrate_legacy_files(sample_image, tmp_path, mock_product_data):
+    """Test that flat-layout files are moved into shards and recorded."""
+    from src.database.db_manager import DatabaseManager
+
+    db_manager = DatabaseManager(str(tmp_path / "legacy.db"))
+    db_manager.setup_database()
+    db_manager.store_product(mock_product_data)
+    raw_dir, processed_dir = tmp_path / "raw", tmp_path / "processed"
+    raw_dir.mkdir()
+    processed_dir.mkdir()
+    (raw_dir / "Gadgets_test123_original").write_bytes(sample_image)
+    (raw_dir / "Toys_unknown_original").write_bytes(sample_image)
+    (processed_dir / "Gadgets_test123_100x100.jpg").write_bytes(sample_image)
+    (processed_dir / "Gadgets_test123_200x200.jpg").write_bytes(b"old")
+    processor = ImageProcessor(
+        str(raw_dir), str(processed_dir), requests.Session(), db_manager=db_manager
+    )
+    shard = processor.shard_folder(str(processed_dir), "test123")
+    os.makedirs(shard)
+    with open(os.path.join(shard, "Gadgets_test123_200x200.jpg"), "wb") as f:
+        f.write(b"newer")
+
+    stats = processor.migrate_legacy_files(batch_size=1)
+
+    assert stats == {"legacy_files": 2, "superseded_files": 1, "superseded_bytes": 3}
+    assert not (processed_dir / "Gadgets_test123_200x200.jpg").exists()
+    assert (raw_dir / "Toys_unknown_original").exists()
+    original = db_manager.get_images("test123", kind="original")[0]
+    assert original["path"] == os.path.join(
+        processor.shard_folder(str(raw_dir), "test123"), "Gadgets_test123_original"
+    )
+    assert os.path.exists(original["path"])
+    assert original["source_url"] == mock_product_data["image_url"]
+    derivative = db_manager.get_images("test123", kind="derivative")[0]
+    assert (derivative["target_width"], derivative["target_height"]) == (100, 100)
+
+    # The migrated original is reused instead of downloaded again
+    session = Mock()
+    processor.session = session
+    path = processor.download_image(
+        mock_product_data["image_url"], "Gadgets", "test123", {}
+    )
+    assert path == original["path"]
+    session.get.assert_not_called()
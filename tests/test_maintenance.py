@@ -0,0 +1,127 @@
+# tests/test_maintenance.py
+import os
+import sys
+import sqlite3
+import pytest
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database.db_manager import DatabaseManager
+from src.database.maintenance import print_maintenance_report, run_maintenance
+
+
+def image_record(path, product_id, source_url, target=None):
+    record = {
+        "path": str(path),
+        "product_id": product_id,
+        "kind": "derivative" if target else "original",
+        "source_url": source_url,
+        "bytes": 4,
+    }
+    if target:
+        record.update({"target_width": target, "target_height": target})
+    return record
+
+
+@pytest.fixture
+def db_manager(tmp_path, mock_product_data):
+    manager = DatabaseManager(str(tmp_path / "maintenance.db"))
+    manager.setup_database()
+    manager.store_product(mock_product_data)
+    return manager
+
+
+def test_maintenance_removes_stale_images(db_manager, mock_product_data, tmp_path):
+    """Test that orphaned, outdated and superseded images are removed."""
+    image_url = mock_product_data["image_url"]
+    paths = {
+        name: tmp_path / name
+        for name in ["current", "old_category", "old_url", "deleted_product"]
+    }
+    for path in paths.values():
+        path.write_bytes(b"data")
+
+    db_manager.store_image_records(
+        [
+            image_record(paths["old_category"], "test123", image_url, 100),
+            image_record(paths["old_url"], "test123", "https://old.example.com/x.jpg"),
+            image_record(paths["deleted_product"], "gone", image_url),
+        ]
+    )
+    conn = sqlite3.connect(db_manager.db_name)
+    conn.execute("UPDATE images SET updated_at = '2020-01-01T00:00:00'")
+    conn.commit()
+    conn.close()
+    db_manager.store_image_records(
+        [image_record(paths["current"], "test123", image_url, 100)]
+    )
+
+    stats = run_maintenance(db_manager.db_name, batch_size=1)
+
+    assert stats["image_rows"] == 3
+    assert stats["image_files"] == 3
+    assert stats["image_bytes"] == 12
+    assert paths["current"].exists()
+    assert not paths["old_category"].exists()
+    assert [i["path"] for i in db_manager.get_images("test123")] == [
+        str(paths["current"])
+    ]
+
+
+def test_maintenance_enables_incremental_vacuum(tmp_path):
+    """Test that compaction converts legacy databases to incremental vacuum."""
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    # Crear una tabla antes de setup_database fija auto_vacuum en NONE
+    conn.execute("CREATE TABLE legacy (id INTEGER)")
+    conn.commit()
+    conn.close()
+    DatabaseManager(db_path).setup_database()
+
+    run_maintenance(db_path)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.close()
+
+
+def test_maintenance_keeps_unrecorded_files(db_manager, tmp_path):
+    """Test that files without an images row are never deleted."""
+    legacy = tmp_path / "product_images" / "Gadgets_test123_100x100.jpg"
+    legacy.parent.mkdir()
+    legacy.write_bytes(b"data")
+
+    stats = run_maintenance(db_manager.db_name)
+
+    assert legacy.exists()
+    assert stats["image_files"] == 0
+
+
+def test_maintenance_report_never_negative(db_manager, capsys):
+    """Test that a database grown by ANALYZE is reported with both sizes."""
+    stats = run_maintenance(db_manager.db_name)
+    print_maintenance_report(stats)
+
+    assert stats["database_bytes"] >= 0
+    assert stats["database_size_after"] >= stats["database_size_before"]
+    assert "-" not in capsys.readouterr().out.split("reclaimed")[-1]
+
+
+def test_maintenance_empties_freelist(db_manager, mock_product_data):
+    """Test that the incremental vacuum releases every free page."""
+    for i in range(200):
+        db_manager.store_product(
+            dict(mock_product_data, product_id=f"p{i}", description="x" * 2000)
+        )
+    conn = sqlite3.connect(db_manager.db_name)
+    conn.execute("DELETE FROM products WHERE product_id != 'test123'")
+    conn.commit()
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] > 1
+    conn.close()
+
+    stats = run_maintenance(db_manager.db_name)
+
+    conn = sqlite3.connect(db_manager.db_name)
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
+    assert stats["database_bytes"] > 0
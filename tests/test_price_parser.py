@@ -0,0 +1,79 @@
+# tests/test_price_parser.py
+import os
+import sys
+import pytest
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.scraper.price_parser import normalize_prices
+
+
+@pytest.mark.parametrize(
+    "raw, value, currency",
+    [
+        ("99.99€", 99.99, "EUR"),
+        ("12,50 €", 12.5, "EUR"),
+        ("1.299,50 €", 1299.5, "EUR"),
+        ("$1,299.00", 1299.0, "USD"),
+        ("1 234,56 €", 1234.56, "EUR"),
+        ("£1,000", 1000.0, "GBP"),
+        ("USD 10", 10.0, "USD"),
+        ("0", 0.0, None),
+        ("1.234,567", 1234.567, None),
+        ("-3.50 €", -3.5, "EUR"),
+    ],
+)
+def test_normalize_valid_prices(raw, value, currency):
+    """Test parsing of prices with thousands separators and currencies."""
+    result = normalize_prices([raw])
+
+    assert result["valid"] == [True]
+    assert result["value"][0] == pytest.approx(value)
+    assert result["currency"] == [currency]
+
+
+def test_normalize_flags_invalid_prices():
+    """Test that malformed prices are flagged without affecting the rest."""
+    result = normalize_prices(["9.99€", "Free!", None, "", "19.99€"])
+
+    assert result["valid"] == [True, False, True, False, True]
+    assert result["value"] == [9.99, None, None, None, 19.99]
+    assert result["currency"] == ["EUR", None, None, None, "EUR"]
+
+
+def test_normalize_empty_page():
+    """Test that an empty page yields empty columns."""
+    assert normalize_prices([]) == {"value": [], "currency": [], "valid": []}
+
+
+@pytest.mark.parametrize(
+    "raw", ["5€ 10€", "1 2", "€€5", "$5€", "1,2,3", "1.234.5", "1,234.5.6"]
+)
+def test_normalize_rejects_malformed_prices(raw):
+    """Test that each row must be a single price with at most one currency."""
+    assert normalize_prices([raw]) == {
+        "value": [None],
+        "currency": [None],
+        "valid": [False],
+    }
+
+
+def test_normalize_currency_per_row():
+    """Test that the currency of a row does not depend on the rest of the page."""
+    assert normalize_prices(["$5.00"])["currency"] == ["USD"]
+    result = normalize_prices(["$5.00", "5.00€", "7"])
+    assert result["currency"] == ["USD", "EUR", None]
+
+
+def test_normalize_uniform_page():
+    """Test that a single-format page parses like row by row, and falls back."""
+    page = ["USD 5.00", "USD 1234.50", "USD 0.99"]
+    assert normalize_prices(page) == {
+        "value": [5.0, 1234.5, 0.99],
+        "currency": ["USD"] * 3,
+        "valid": [True] * 3,
+    }
+
+    result = normalize_prices(["5.00€", "6.00€", "7€ 8€", "9.00€\n1.00€"])
+    assert result["valid"] == [True, True, False, False]
+    assert result["value"] == [5.0, 6.0, None, None]
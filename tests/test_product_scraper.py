@@ -37,3 +37,22 @@ def test_parse_product_data(scraper, mock_html_content):
     assert product_data["price"] == 99.99
     assert product_data["categories"] == "Electronics,Gadgets"
     assert product_data["image_url"] == "https://example.com/image.jpg"
+
+
+def test_fetch_products_keeps_invalid_prices(scraper, mock_html_content):
+    """Test that a card with a malformed price is flagged, not dropped."""
+    invalid_card = mock_html_content.replace("test123", "bad1").replace(
+        "99.99€", "Call us"
+    )
+    mock_resp = Mock(text=mock_html_content + invalid_card)
+    mock_resp.raise_for_status = Mock()
+
+    with patch.object(scraper.session, "get", return_value=mock_resp):
+        products = scraper.fetch_products(1)
+
+    assert [p["product_id"] for p in products] == ["test123", "bad1"]
+    assert products[0]["price"] == 99.99
+    assert products[0]["currency"] == "EUR"
+    assert products[0]["price_valid"] is True
+    assert products[1]["price"] is None
+    assert products[1]["price_valid"] is False
@@ -0,0 +1,58 @@
+# tests/test_profiling.py
+import os
+import sys
+import tracemalloc
+import pytest
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.profiling import StageProfiler
+
+
+def allocate():
+    return [bytearray(1024) for _ in range(100)]
+
+
+def test_stage_profiles_written(tmp_path):
+    """Test that sampled stages produce .prof files and text summaries."""
+    profiler = StageProfiler(sample_rate=0.5)
+    kept = []
+    for _ in range(4):
+        with profiler.stage("db"):
+            kept.append(allocate())
+
+    written = profiler.write(str(tmp_path))
+
+    assert sorted(os.path.basename(path) for path in written) == ["db.prof", "db.txt"]
+    summary = (tmp_path / "db.txt").read_text(encoding="utf-8")
+    assert "Calls: 4, sampled: 2" in summary
+    assert "allocate" in summary
+    assert "test_profiling.py" in summary.split("Top allocations")[1]
+
+
+def test_stage_traces_only_retained_memory():
+    """Test that tracing stops after each stage and freed memory is not counted."""
+    profiler = StageProfiler()
+    with profiler.stage("db"):
+        allocate()
+
+    assert not tracemalloc.is_tracing()
+    allocations = profiler.summary("db").split("Top allocations")[1].splitlines()[1:]
+    # allocate() crea ~100 KB que se liberan antes de salir de la etapa
+    assert sum(int(line.split()[0]) for line in allocations) < 100 * 1024
+
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    """Test that a disabled profiler records nothing."""
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage("crawl"):
+        allocate()
+
+    assert profiler.write(str(tmp_path / "profiles")) == []
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_invalid_sample_rate():
+    """Test that sample rates outside (0, 1] are rejected."""
+    with pytest.raises(ValueError):
+        StageProfiler(sample_rate=0)
@@ -0,0 +1,94 @@
+# tests/test_queries.py
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.database.db_manager import DatabaseManager
+from src.database.queries import LRUCache, ProductQueries
+
+
+@pytest.fixture
+def db_manager(tmp_path, mock_product_data):
+    manager = DatabaseManager(str(tmp_path / "queries.db"))
+    manager.setup_database()
+    manager.store_product(mock_product_data)
+    manager.store_product(
+        dict(mock_product_data, product_id="cheap1", price=5.0, categories="Toys")
+    )
+    return manager
+
+
+@pytest.fixture
+def queries(db_manager):
+    product_queries = ProductQueries(db_manager.db_name)
+    yield product_queries
+    product_queries.close()
+
+
+def test_lookups(queries):
+    """Test id, category and price range lookups."""
+    assert queries.get_product("test123")["name"] == "Test Product"
+    assert queries.get_product("missing") is None
+
+    gadgets = queries.get_category_page("Gadgets")
+    assert [p["product_id"] for p in gadgets] == ["test123"]
+
+    cheap = queries.get_price_range(0, 10)
+    assert [p["product_id"] for p in cheap] == ["cheap1"]
+
+
+def test_cache_invalidated_on_write(queries, db_manager, mock_product_data):
+    """Test that cached results are dropped after the database changes."""
+    assert queries.get_product("test123")["price"] == 99.99
+    queries.get_product("test123")
+    assert queries.cache.hits == 1
+
+    db_manager.store_product(dict(mock_product_data, price=49.99))
+
+    assert queries.get_product("test123")["price"] == 49.99
+
+
+def test_cache_invalidated_for_new_thread(queries, db_manager, mock_product_data):
+    """Test that a thread started after a write never sees the cached value."""
+    assert queries.get_product("test123")["price"] == 99.99
+
+    db_manager.store_product(dict(mock_product_data, price=20.0))
+
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(queries.get_product("test123")["price"])
+    )
+    thread.start()
+    thread.join()
+    assert results == [20.0]
+
+
+def test_cache_invalidated_for_existing_thread(queries, db_manager, mock_product_data):
+    """Test that a thread reusing its connection notices writes by others."""
+
+    def lookup():
+        return queries.get_product("test123")["price"]
+
+    with ThreadPoolExecutor(max_workers=1) as worker:
+        assert worker.submit(lookup).result() == 99.99
+        assert queries.get_product("test123")["price"] == 99.99
+
+        db_manager.store_product(dict(mock_product_data, price=30.0))
+
+        assert worker.submit(lookup).result() == 30.0
+        assert queries.get_product("test123")["price"] == 30.0
+
+
+def test_stale_put_is_discarded():
+    """Test that rows read before an invalidation are not cached."""
+    cache = LRUCache()
+    generation = cache.generation
+    cache.invalidate()
+
+    cache.put(("id", "a"), "stale", generation)
+
+    assert cache.get(("id", "a"), cache.generation) == (False, None)